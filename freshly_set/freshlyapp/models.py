@@ -1,5 +1,6 @@
 # from argon2 import hash_password
 import os
+from decimal import Decimal
 from PIL import Image
 from django.core.exceptions import ValidationError
 from better_profanity import profanity
@@ -126,6 +127,17 @@ class Product(models.Model):
         upload_to='static/images/Products', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True, blank=True, null=True)
 
+    class Meta:
+        # Enforced by the database too, so bulk loads that skip clean() stay in range
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(price__gte=Decimal('0.01')) & models.Q(price__lte=Decimal('99999.99')),
+                name='product_price_range'),
+            models.CheckConstraint(
+                check=models.Q(qtty__gte=0) & models.Q(qtty__lte=10000),
+                name='product_qtty_range'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -236,6 +248,13 @@ class Service(models.Model):
         return f'{self.get_type_display()} - {self.price}'
 
 
+class BlogQuerySet(models.QuerySet):
+    def search(self, query):
+        # Case-insensitive match on title or content in a single WHERE clause
+        return self.filter(
+            models.Q(title__icontains=query) | models.Q(content__icontains=query))
+
+
 class Blog(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True,  # Allow null temporarily
                              blank=True)  # Allow blank temporarily
@@ -249,6 +268,8 @@ class Blog(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = BlogQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Blog")
         verbose_name_plural = _("Blogs")
@@ -307,11 +328,14 @@ class Poll(models.Model):
         return self.votes.count()
 
     def vote_counts(self):
+        # One GROUP BY query instead of a COUNT per choice
+        counts = dict(self.votes.order_by().values_list('choice').annotate(
+            total=models.Count('id')))
         return {
-            'yes': self.votes.filter(choice='YES').count(),
-            'no': self.votes.filter(choice='NO').count(),
-            'maybe': self.votes.filter(choice='MAYBE').count(),
-            'other': self.votes.filter(choice='OTHER').count(),
+            'yes': counts.get('YES', 0),
+            'no': counts.get('NO', 0),
+            'maybe': counts.get('MAYBE', 0),
+            'other': counts.get('OTHER', 0),
         }
 
 
@@ -541,6 +565,12 @@ class CartItem(models.Model):
 
     MAX_QUANTITY = 100  # Define a constant for the maximum quantity allowed
 
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(quantity__gte=1), name='cartitem_quantity_min'),
+        ]
+
     @property
     def total_price(self):
         return self.quantity * self.product.price
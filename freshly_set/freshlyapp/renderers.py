@@ -0,0 +1,29 @@
+# JSON renderer backed by orjson for faster encoding of large API responses
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# DRF's encoder knows how to turn lazy strings, decimals, querysets etc. into JSON types
+_drf_default = JSONEncoder().default
+
+
+# orjson.dumps with U+2028 and U+2029 escaped like DRF, so the output is also valid JavaScript
+def dumps(data, default=_drf_default, option=0):
+    ret = orjson.dumps(data, default=default, option=option)
+    return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONRenderer(JSONRenderer):
+    # Unlike DRF's renderer, float NaN/Infinity are written as null rather
+    # than raising under STRICT_JSON; the serializers here never produce them.
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        # OPT_UTC_Z writes UTC datetimes with a trailing "Z", as DRF does
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+
+        return dumps(data, option=option)
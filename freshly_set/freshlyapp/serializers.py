@@ -1,4 +1,6 @@
 import os
+from decimal import Decimal
+from functools import lru_cache
 from PIL import Image
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
@@ -6,7 +8,6 @@ from rest_framework import serializers
 from .models import Blog, Product, Garden, Comment, Like, Share, Poll, Vote, IDVerification, Review, Farmer, Cart, CartItem, Banner, Category, Notification
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework.validators import ValidationError
-from django.contrib.auth.models import User
 from better_profanity import profanity
 
 from rest_framework import serializers
@@ -15,6 +16,14 @@ from .models import Order, OrderItem
 
 UserModel = get_user_model()
 
+# Load the wordlist once at import instead of on the first request
+profanity.load_censor_words()
+
+
+@lru_cache(maxsize=1024)
+def _has_profanity(text):
+    return profanity.contains_profanity(text)
+
 
 class UserRegisterSerializer(serializers.ModelSerializer):
     class Meta:
@@ -45,7 +54,7 @@ class UserLoginSerializer(serializers.Serializer):
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
-        model = User
+        model = UserModel
         fields = ['email', 'username']
 
 
@@ -53,73 +62,89 @@ class ProductSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Product
-        fields = '__all__'
+        fields = ['id', 'name', 'desc', 'price', 'qtty', 'unit',
+                  'image', 'created_at', 'category']
+        # Range and length checks run as field validators, before validate()
+        extra_kwargs = {
+            'name': {
+                'error_messages': {
+                    'blank': 'Name cannot be empty.',
+                    'max_length': 'Name cannot exceed 255 characters.',
+                },
+            },
+            'desc': {
+                'min_length': 10,
+                'error_messages': {
+                    'blank': 'Description is too short. It should be at least 10 characters long.',
+                    'min_length': 'Description is too short. It should be at least 10 characters long.',
+                },
+            },
+            'price': {
+                'min_value': Decimal('0.01'),
+                'max_value': Decimal('99999.99'),
+                'error_messages': {
+                    'min_value': 'Price must be between 0.01 and 99999.99.',
+                    'max_value': 'Price must be between 0.01 and 99999.99.',
+                    'max_decimal_places': 'Price cannot have more than two decimal places.',
+                },
+            },
+            'qtty': {
+                'min_value': 0,
+                'max_value': 10000,
+                'error_messages': {
+                    'min_value': 'Quantity cannot be negative.',
+                    'max_value': 'Quantity cannot exceed 10,000.',
+                },
+            },
+        }
 
     def validate(self, data):
-        # Price validation
-        if data.get('price', 0) < 0:
-            raise serializers.ValidationError(
-                {'price': 'Price cannot be negative.'})
-
-        if not (0.01 <= data.get('price', 0) <= 99999.99):
-            raise serializers.ValidationError(
-                {'price': 'Price must be between 0.01 and 99999.99.'})
-
-        if len(str(data.get('price', 0)).split('.')[-1]) > 2:
-            raise serializers.ValidationError(
-                {'price': 'Price cannot have more than two decimal places.'})
-
-        # Quantity validation
-        if data.get('qtty', 0) < 0:
-            raise serializers.ValidationError(
-                {'qtty': 'Quantity cannot be negative.'})
-
-        if data.get('qtty', 0) > 10000:
-            raise serializers.ValidationError(
-                {'qtty': 'Quantity cannot exceed 10,000.'})
-
-        # Name validation
-        if len(data.get('name', '').strip()) == 0:
-            raise serializers.ValidationError(
-                {'name': 'Name cannot be empty.'})
-
-        if len(data.get('name', '')) > 255:
-            raise serializers.ValidationError(
-                {'name': 'Name cannot exceed 255 characters.'})
+        desc = data.get('desc', '')
+        image = data.get('image')
+        errors = {}
 
         # Description validation
-        if len(data.get('desc', '')) < 10:
-            raise serializers.ValidationError(
-                {'desc': 'Description is too short. It should be at least 10 characters long.'})
-
-        if profanity.contains_profanity(data.get('desc', '')):
-            raise serializers.ValidationError(
-                {'desc': 'Description contains prohibited or inappropriate content.'})
+        if _has_profanity(desc):
+            errors['desc'] = 'Description contains prohibited or inappropriate content.'
 
         # Image validation
-        image = data.get('image')
         if image:
             ext = os.path.splitext(image.name)[1].lower()
             valid_extensions = ['.jpg', '.jpeg', '.png']
             if ext not in valid_extensions:
-                raise serializers.ValidationError(
-                    {'image': 'Unsupported file extension. Allowed extensions are: .jpg, .jpeg, .png'})
-
-            if image.size > 5 * 1024 * 1024:
-                raise serializers.ValidationError(
-                    {'image': 'Image file size cannot exceed 5MB.'})
-
-            image = Image.open(image)
-            width, height = image.size
-            if width < 800 or height < 600:
-                raise serializers.ValidationError(
-                    {'image': 'Image resolution too low. Minimum resolution is 800x600.'})
-            if width > 4000 or height > 3000:
-                raise serializers.ValidationError(
-                    {'image': 'Image resolution too high. Maximum resolution is 4000x3000.'})
+                errors['image'] = 'Unsupported file extension. Allowed extensions are: .jpg, .jpeg, .png'
+            elif image.size > 5 * 1024 * 1024:
+                errors['image'] = 'Image file size cannot exceed 5MB.'
+            else:
+                width, height = Image.open(image).size
+                if width < 800 or height < 600:
+                    errors['image'] = 'Image resolution too low. Minimum resolution is 800x600.'
+                elif width > 4000 or height > 3000:
+                    errors['image'] = 'Image resolution too high. Maximum resolution is 4000x3000.'
+
+        if errors:
+            raise serializers.ValidationError(errors)
 
         return data
 
+    def to_representation(self, instance):
+        # Straight-line version of ModelSerializer.to_representation for the
+        # product listings; keep in step with Meta.fields. Decimal, image and
+        # datetime values still go through DRF's field formatting.
+        fields = self.fields
+        created_at = instance.created_at
+        return {
+            'id': instance.id,
+            'name': instance.name,
+            'desc': instance.desc,
+            'price': fields['price'].to_representation(instance.price),
+            'qtty': instance.qtty,
+            'unit': instance.unit,
+            'image': fields['image'].to_representation(instance.image),
+            'created_at': fields['created_at'].to_representation(created_at) if created_at else None,
+            'category': instance.category_id,
+        }
+
 
 class ReviewSerializer(serializers.ModelSerializer):
     # Nested serializer to display product details
@@ -236,7 +261,9 @@ class IDVerificationSerializer(serializers.ModelSerializer):
 
     def validate(self, data):
         """
-        Validate and verify the ID number and photo.
+        Validate the ID number format. The photo is compared against the
+        document only once, by verify_user() in update(), so the Rekognition
+        call is not repeated during validation.
         """
         instance = self.instance if self.instance else IDVerification(**data)
 
@@ -245,11 +272,6 @@ class IDVerificationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 {"id_document_number": "Invalid ID number format for the selected document type."})
 
-        # Validate and verify photo
-        if not instance.verify_photo():
-            raise serializers.ValidationError(
-                {"photo_image": "Photo verification failed. The photo does not match the ID document."})
-
         return data
 
     def update(self, instance, validated_data):
@@ -312,31 +334,87 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', "image", "bgColor"]
 
 
+class CartItemProductField(serializers.PrimaryKeyRelatedField):
+    def to_internal_value(self, data):
+        # Bulk requests preload their products in one query (see CartItemListSerializer)
+        products = self.context.get('products')
+        if products is not None:
+            try:
+                return products[int(data)]
+            except (KeyError, TypeError, ValueError):
+                pass
+        return super().to_internal_value(data)
+
+
+class CartItemListSerializer(serializers.ListSerializer):
+    MAX_ITEMS = 100
+
+    def __init__(self, *args, **kwargs):
+        # A bulk request must carry at least one item and at most MAX_ITEMS
+        kwargs.setdefault('allow_empty', False)
+        kwargs.setdefault('max_length', self.MAX_ITEMS)
+        super().__init__(*args, **kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            product_ids = set()
+            for item in data:
+                try:
+                    product_ids.add(int(item.get('product')))
+                except (AttributeError, TypeError, ValueError):
+                    pass
+            self.context['products'] = Product.objects.in_bulk(product_ids)
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        # Stock is checked per item, so a product may only appear once per batch
+        product_ids = [item['product'].pk for item in attrs]
+        if len(set(product_ids)) != len(product_ids):
+            raise serializers.ValidationError(
+                'Each product can only appear once. Combine the quantities into one item.')
+        return attrs
+
+    def create(self, validated_data):
+        # One INSERT for the whole batch; each item was already validated by CartItemSerializer.
+        # MySQL does not return primary keys from bulk_create, so "id" is null in the response there.
+        return CartItem.objects.bulk_create([CartItem(**item) for item in validated_data])
+
+
 class CartItemSerializer(serializers.ModelSerializer):
+    product = CartItemProductField(queryset=Product.objects.all())
+
     class Meta:
         model = CartItem
         fields = '__all__'
+        read_only_fields = ['cart']
+        list_serializer_class = CartItemListSerializer
+        # Quantity bounds run as field validators, before validate()
+        extra_kwargs = {
+            'quantity': {
+                'min_value': 1,
+                'max_value': CartItem.MAX_QUANTITY,
+                'error_messages': {
+                    'min_value': 'Quantity must be at least 1.',
+                    'max_value': f'Quantity cannot exceed {CartItem.MAX_QUANTITY} per product.',
+                },
+            },
+        }
 
     def validate(self, data):
-        # Quantity validation
-        if data.get('quantity', 0) <= 0:
-            raise serializers.ValidationError(
-                {'quantity': 'Quantity must be at least 1.'})
+        product = data.get('product')
+        # An omitted quantity falls back to the model default of 1
+        quantity = data.get('quantity', 1)
 
-        # Max quantity validation
-        if data.get('quantity', 0) > CartItem.MAX_QUANTITY:
+        # Ensure product exists
+        if not product:
             raise serializers.ValidationError(
-                {'quantity': f'Quantity cannot exceed {CartItem.MAX_QUANTITY} per product.'})
+                {'product': 'Product must exist for the cart item.'})
 
         # Stock availability validation
-        if data['quantity'] > data['product'].qtty:
+        stock = product.qtty
+        if quantity > stock:
             raise serializers.ValidationError(
-                {'quantity': f'Not enough stock. Available stock is {data["product"].qtty}.'})
-
-        # Ensure product exists
-        if not data.get('product'):
-            raise serializers.ValidationError(
-                {'product': 'Product must exist for the cart item.'})
+                {'quantity': f'Not enough stock. Available stock is {stock}.'})
 
         return data
 
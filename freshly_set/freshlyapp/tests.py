@@ -1,8 +1,19 @@
 # Create your tests here.
 # freshlyapp/tests.py
+import datetime
+import json
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from django.urls import reverse
-from .models import Product
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase
+from .models import Blog, Cart, CartItem, Category, Product
+from .renderers import ORJSONRenderer
+from .serializers import CartItemListSerializer, ProductSerializer
 
 class ProductTests(TestCase):
 
@@ -18,3 +29,217 @@ class ProductTests(TestCase):
         response = self.client.get(reverse('home'))
         self.assertEqual(response.status_code, 200)
 
+
+
+# Bulk cart item endpoint
+
+class CartItemBulkCreateTests(APITestCase):
+
+    def setUp(self):
+        self.alice = User.objects.create(username='alice')
+        self.bob = User.objects.create(username='bob')
+        self.apples = Product.objects.create(
+            name='Apples', desc='Fresh green apples', price=Decimal('2.50'), qtty=10)
+        self.kale = Product.objects.create(
+            name='Kale', desc='Organic curly kale', price=Decimal('1.20'), qtty=10)
+        self.url = reverse('cart_item_bulk_create')
+        self.client.force_authenticate(self.alice)
+
+    def test_items_go_into_the_requesting_users_cart(self):
+        bob_cart = Cart.objects.create(user=self.bob)
+        response = self.client.post(self.url, [
+            {'cart': bob_cart.id, 'product': self.apples.id, 'quantity': 2},
+            {'product': self.kale.id, 'quantity': 3},
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(CartItem.objects.filter(cart=bob_cart).exists())
+        self.assertEqual(CartItem.objects.filter(cart__user=self.alice).count(), 2)
+
+    def test_duplicate_products_in_batch_are_rejected(self):
+        response = self.client.post(self.url, [
+            {'product': self.apples.id, 'quantity': 8},
+            {'product': self.apples.id, 'quantity': 8},
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CartItem.objects.exists())
+
+    def test_product_already_in_cart_is_rejected(self):
+        cart = Cart.objects.create(user=self.alice)
+        CartItem.objects.create(cart=cart, product=self.apples, quantity=1)
+        response = self.client.post(self.url, [
+            {'product': self.apples.id, 'quantity': 2},
+            {'product': self.kale.id, 'quantity': 2},
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(CartItem.objects.count(), 1)
+
+    def test_empty_and_oversized_batches_are_rejected(self):
+        response = self.client.post(self.url, [], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Cart.objects.exists())
+
+        items = [{'product': self.apples.id, 'quantity': 1}] * (CartItemListSerializer.MAX_ITEMS + 1)
+        response = self.client.post(self.url, items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('no more than', str(response.data))
+        self.assertFalse(CartItem.objects.exists())
+
+    def test_quantity_above_stock_is_rejected(self):
+        response = self.client.post(self.url, [
+            {'product': self.kale.id, 'quantity': 11},
+        ], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(CartItem.objects.exists())
+
+
+# Product bulk import endpoint and the range constraints it relies on
+
+class ProductBulkImportTests(APITestCase):
+
+    def setUp(self):
+        self.url = reverse('import-products')
+        self.row = {'name': 'Carrots', 'desc': 'Crunchy orange carrots', 'price': '3.50', 'qtty': 4}
+        self.client.force_authenticate(User.objects.create(username='admin', is_staff=True))
+
+    def test_import_creates_products(self):
+        response = self.client.post(self.url, [self.row, dict(self.row, name='Beets')], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_out_of_range_row_rejects_whole_batch(self):
+        response = self.client.post(self.url, [self.row, dict(self.row, qtty=20000)], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Product.objects.exists())
+
+    def test_price_with_too_many_digits_is_rejected(self):
+        response = self.client.post(self.url, [dict(self.row, price='123456789012.5')], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('price', response.data['fields'])
+
+    def test_name_too_long_is_rejected(self):
+        response = self.client.post(self.url, [dict(self.row, name='x' * 256)], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('name', response.data['fields'])
+
+    def test_model_clean_rules_apply(self):
+        for bad in ({'desc': 'Too short'}, {'name': '   '}):
+            response = self.client.post(self.url, [dict(self.row, **bad)], format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(next(iter(bad)), response.data['fields'])
+        self.assertFalse(Product.objects.exists())
+
+    def test_non_scalar_value_is_rejected(self):
+        response = self.client.post(self.url, [dict(self.row, unit=['a'])], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('unit', response.data['fields'])
+
+    def test_category_must_exist(self):
+        category = Category.objects.create(name='Roots', description='Root vegetables')
+        response = self.client.post(self.url, [dict(self.row, category_id=category.id + 1)], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('category_id', response.data['fields'])
+
+        response = self.client.post(self.url, [dict(self.row, category_id=category.id)], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Product.objects.get().category, category)
+
+    def test_non_admin_is_forbidden(self):
+        self.client.force_authenticate(User.objects.create(username='shopper'))
+        response = self.client.post(self.url, [self.row], format='json')
+        self.assertEqual(response.status_code, 403)
+
+
+class ProductConstraintTests(TestCase):
+    # save() runs clean(), so go through bulk_create to reach the database checks
+
+    def test_price_must_be_positive(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Product.objects.bulk_create([Product(name='Free', desc='Nothing to pay', price=Decimal('0'), qtty=1)])
+
+    def test_qtty_upper_bound(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Product.objects.bulk_create([Product(name='Bulk', desc='Far too much stock', price=Decimal('1'), qtty=10001)])
+
+    def test_cart_item_quantity_must_be_positive(self):
+        cart = Cart.objects.create(user=User.objects.create(username='carol'))
+        product = Product.objects.create(name='Leeks', desc='Fresh leeks', price=Decimal('1'), qtty=5)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            CartItem.objects.bulk_create([CartItem(cart=cart, product=product, quantity=0)])
+
+
+# Streamed JSON listings
+class StreamedListingTests(APITestCase):
+
+    def test_stream_blogs(self):
+        blog = Blog.objects.create(title='Harvest notes', content='Line one\u2028line two')
+        response = self.client.get(reverse('stream_blogs'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        body = b''.join(response.streaming_content)
+        # Escaped like ORJSONRenderer so the body is also valid JavaScript
+        self.assertNotIn('\u2028'.encode(), body)
+        self.assertEqual(json.loads(body), [
+            {'id': blog.id, 'title': 'Harvest notes', 'content': 'Line one\u2028line two'},
+        ])
+
+    def test_export_products(self):
+        product = Product.objects.create(
+            name='Onions', desc='Red onions by the kilo', price=Decimal('4.25'), qtty=7)
+        self.client.force_authenticate(User.objects.create(username='exporter'))
+        response = self.client.get(reverse('export-products'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), [
+            {'id': product.id, 'name': 'Onions', 'price': '4.25', 'qtty': 7, 'desc': 'Red onions by the kilo'},
+        ])
+
+
+# ProductSerializer.to_representation is written out by hand; it must match DRF's
+class ProductSerializerOutputTests(TestCase):
+
+    def setUp(self):
+        category = Category.objects.create(name='Greens', description='Leafy greens')
+        self.full = Product.objects.create(
+            name='Spinach', desc='Baby spinach leaves', price=Decimal('3.10'), qtty=5, category=category)
+        # update() skips Product.clean(), which would try to open the image file
+        Product.objects.filter(pk=self.full.pk).update(image='static/images/Products/spinach.jpg')
+        self.full.refresh_from_db()
+        self.bare = Product.objects.create(
+            name='Chard', desc='Rainbow chard bunches', price=Decimal('2.00'), qtty=3)
+
+    def assertMatchesModelSerializer(self, context):
+        for product in (self.full, self.bare):
+            serializer = ProductSerializer(context=context)
+            self.assertEqual(
+                serializer.to_representation(product),
+                serializers.ModelSerializer.to_representation(serializer, product))
+
+    def test_matches_without_request(self):
+        self.assertMatchesModelSerializer({})
+
+    def test_matches_with_request(self):
+        self.assertMatchesModelSerializer({'request': APIRequestFactory().get('/products/')})
+
+
+# ORJSONRenderer is the default renderer, so its output must match DRF's byte for byte
+class ORJSONRendererTests(TestCase):
+
+    def test_matches_drf_json_renderer(self):
+        data = {
+            'price': Decimal('12.50'),
+            'label': gettext_lazy('Fresh produce'),
+            'created_at': datetime.datetime(2024, 5, 1, 8, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'naive': datetime.datetime(2024, 5, 1, 8, 30),
+            'day': datetime.date(2024, 5, 1),
+            1: 'numeric key',
+            'text': 'line\u2028separator\u2029paragraph caf\u00e9',
+            'items': [None, True, 3, 2.5],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_matches_drf_json_renderer_indented(self):
+        data = {'name': 'Kale', 'tags': ['leafy', 'green']}
+        context = {'indent': 2}
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json', context),
+            JSONRenderer().render(data, 'application/json', context))
@@ -3,6 +3,7 @@ from django.urls import path, re_path, include
 from django.contrib.auth import views as auth_views
 from django.urls import re_path
 from django.views.generic import TemplateView
+from django.views.decorators.cache import cache_page
 from rest_framework.routers import DefaultRouter
 from .views import BlogListCreateView, BlogListView, CustomPasswordResetView, Register, search_blog
 from .views import PollDetailView, PollListCreateView, VerifyIDView, SubmitVote, IDVerificationUpdateView, IDVerificationDetailView, BannerListView, CategoryListCreateView, CategoryDetailView, vote_poll
@@ -19,6 +20,9 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
+# The React shell is the same for every frontend route, so render it once an hour
+react_app = cache_page(60 * 60)(TemplateView.as_view(template_name='index.html'))
+
 
 from .views import (
     BlogRetrieveUpdateDestroyAPIView,
@@ -37,11 +41,11 @@ urlpatterns = [
 
 
     # Catch-all route to serve React app for all frontend routes
-    path('', TemplateView.as_view(template_name='index.html')),
+    path('', react_app),
 
-    path('about-us/', TemplateView.as_view(template_name='index.html')),
-    path("marketplace/", TemplateView.as_view(template_name="index.html")),
-        path("signup/", TemplateView.as_view(template_name="index.html")),
+    path('about-us/', react_app),
+    path("marketplace/", react_app),
+        path("signup/", react_app),
 
     # path('blogs/', views.blogs, name='blogs'),
     path('freshlyapp/blogs/', BlogListView.as_view(), name='blog-list'),
@@ -80,6 +84,7 @@ urlpatterns = [
     path('shares/', ShareCreateAPIView.as_view(), name='share_create'),
     # path('search_blog/<int:pk>/', views.search_blog, name='search_blog'),
     path('search_blog/', views.search_blog, name='search_blog'),
+    path('freshlyapp/blogs/stream/', views.stream_blogs, name='stream_blogs'),
 
     path('freshlyapp/token/', TokenObtainPairView.as_view(),
          name='token_obtain_pair'),
@@ -110,6 +115,8 @@ urlpatterns = [
     # product urls
     path('products/', ProductListView.as_view(), name='list-products'),
     path('products/create/', CreateProduct.as_view(), name='create-product'),
+    path('products/export/', ProductExportView.as_view(), name='export-products'),
+    path('products/import/', ProductBulkImportView.as_view(), name='import-products'),
     path('products/<int:pk>/', RetrieveProduct.as_view(), name='retrieve-product'),
     path('products/<int:pk>/update/',
          UpdateProduct.as_view(), name='update-product'),
@@ -135,6 +142,8 @@ urlpatterns = [
     # CART URLS
     path('cart/', views.get_cart_instance, name='get_cart'),
     path('cart/add/', views.add_to_cart, name='add_to_cart'),
+    path('cart/items/bulk/', CartItemBulkCreateView.as_view(),
+         name='cart_item_bulk_create'),
     path('cart/update/', views.update_quantity, name='update_quantity'),
     path('cart/remove/', views.remove_from_cart, name='remove_from_cart'),
 
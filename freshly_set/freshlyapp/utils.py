@@ -0,0 +1,19 @@
+from .renderers import dumps
+
+
+def stream_json_array(rows):
+    """
+    Yield a JSON array one row at a time for a StreamingHttpResponse, so the
+    encoded response body is never built as one string. Pair it with
+    values() so no model instances or serializers are created; note that the
+    MySQL driver still fetches the full result set before rows are yielded.
+    """
+    yield b'['
+    first = True
+    for row in rows:
+        if not first:
+            yield b','
+        first = False
+        # default=str renders decimals as strings, the same as the serializers
+        yield dumps(row, default=str)
+    yield b']'
@@ -8,7 +8,7 @@ from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
-from django.http import HttpResponseNotAllowed, JsonResponse
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
 from .models import Product, Garden, Service, Blog, Banner
 from .forms import ProductForm, ServiceRequestForm
 from django.contrib import messages
@@ -29,20 +29,23 @@ from rest_framework import viewsets
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.views import APIView
 from .models import Blog, Comment, Like, Share, Poll, Vote, IDVerification, Cart, Category, Notification
-from django.db.models import Q
+from django.db import DatabaseError, transaction
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework.generics import get_object_or_404
 from .serializers import BlogSerializer, ProductSerializer, GardenSerializer, CommentSerializer, LikeSerializer, ShareSerializer, PollSerializer, VoteSerializer, IDVerificationSerializer, CartSerializer, BannerSerializer, CategorySerializer, NotificationSerializer
 from django.shortcuts import render
 from rest_framework.authentication import SessionAuthentication, BasicAuthentication
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import permissions, status
 from django.contrib.auth import get_user_model, login, logout
 from .serializers import UserRegisterSerializer, UserLoginSerializer, UserSerializer
 from rest_framework.validators import UniqueValidator
+from rest_framework.exceptions import ValidationError
 # Import your custom validation here
 from .validators import custom_validation, validate_email, validate_password
+from .utils import stream_json_array
 # csrf_protect_method = method_decorator(csrf_protect)
 from django.utils import timezone
 import json
@@ -262,10 +265,7 @@ class BlogListCreateView(generics.ListCreateAPIView):
         queryset = super().get_queryset()
         search_query = self.request.query_params.get('search', None)
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(content__icontains=search_query)
-            )
+            queryset = queryset.search(search_query)
         return queryset
 
 
@@ -355,7 +355,8 @@ class CustomPasswordResetView(PasswordResetView):
 
     def form_valid(self, form):
         email = form.cleaned_data['email']
-        if User.objects.filter(email=email).exists():
+        # Case-insensitive, like the lookup PasswordResetForm.get_users() uses
+        if User.objects.filter(email__iexact=email).exists():
             return super().form_valid(form)
         else:
             messages.error(
@@ -385,12 +386,6 @@ class BlogViewSet(viewsets.ModelViewSet):
     serializer_class = BlogSerializer
     lookup_field = 'slug'
 
-    def retrieve(self, request, slug=None):
-        queryset = self.get_queryset()
-        blog = get_object_or_404(queryset, slug=slug)
-        serializer = BlogSerializer(blog)
-        return Response(serializer.data)
-
 
 # query for blog articles
 """
@@ -407,19 +402,27 @@ class BlogViewSet(viewsets.ModelViewSet):
 def search_blog(request):
     query = request.query_params.get('q', '')
     if query:
-        blogs = Blog.objects.filter(
-            Q(title__icontains=query) | Q(content__icontains=query))
+        blogs = Blog.objects.search(query)
     else:
         blogs = Blog.objects.all()
 
     serializer = BlogSerializer(blogs, many=True)
     return Response(serializer.data)
 
+
+# Streams every blog post as plain rows, skipping model instances and the
+# serializer (the MySQL driver still loads the whole result set)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def stream_blogs(request):
+    blogs = Blog.objects.values('id', 'title', 'content').iterator(chunk_size=500)
+    return StreamingHttpResponse(stream_json_array(blogs), content_type='application/json')
+
 # Polls
 
 
 class PollListCreateView(generics.ListCreateAPIView):
-    queryset = Poll.objects.all()
+    queryset = Poll.objects.prefetch_related('votes')
     serializer_class = PollSerializer
     permission_classes = (AllowAny,)
 
@@ -428,12 +431,12 @@ class PollListCreateView(generics.ListCreateAPIView):
 
 
 class PollDetailView(generics.RetrieveAPIView):
-    queryset = Poll.objects.all()
+    queryset = Poll.objects.prefetch_related('votes')
     serializer_class = PollSerializer
 @permission_classes([AllowAny])
 class PollListView(APIView):
     def get(self, request):
-        polls = Poll.objects.all()
+        polls = Poll.objects.prefetch_related('votes')
         serializer = PollSerializer(polls, many=True)
         return Response(serializer.data)
 
@@ -591,6 +594,65 @@ class ProductListView(APIView):
 
         serializer = ProductSerializer(result_page, many=True)
         return paginator.get_paginated_response(serializer.data)
+
+
+class ProductBulkImportView(APIView):
+    # Loads a list of products in batched INSERTs without the serializer.
+    # Each row goes through clean_fields() and Product.clean(), the same rules
+    # save() applies, and the CHECK constraints on Product back them up.
+    permission_classes = [IsAdminUser]
+    import_fields = ('name', 'desc', 'price', 'qtty', 'unit', 'category_id')
+
+    def post(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return Response({"error": "Expected a list of products."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # One query for every category the batch refers to
+        requested_ids = [row.get('category_id') for row in request.data if isinstance(row, dict)]
+        category_ids = set(Category.objects.filter(
+            id__in=[i for i in requested_ids if isinstance(i, int) and not isinstance(i, bool)]
+        ).values_list('id', flat=True))
+
+        products = []
+        for index, row in enumerate(request.data):
+            if not isinstance(row, dict):
+                return Response({"error": f"Row {index} is not a product object."}, status=status.HTTP_400_BAD_REQUEST)
+            values = {field: row[field] for field in self.import_fields if field in row}
+            try:
+                for field, value in values.items():
+                    if isinstance(value, (list, dict)):
+                        raise DjangoValidationError({field: 'Must be a single value.'})
+                category_id = values.get('category_id')
+                if category_id is not None and (isinstance(category_id, bool) or category_id not in category_ids):
+                    raise DjangoValidationError({'category_id': 'Category does not exist.'})
+
+                product = Product(**values)
+                # category was checked above, so skip its per-row query
+                product.clean_fields(exclude=['category'])
+                product.clean()
+            except DjangoValidationError as e:
+                return Response({"error": f"Row {index} is invalid.", "fields": e.message_dict},
+                                status=status.HTTP_400_BAD_REQUEST)
+            products.append(product)
+
+        try:
+            with transaction.atomic():
+                Product.objects.bulk_create(products, batch_size=1000)
+        except DatabaseError:
+            return Response({"error": "Import rejected by the database."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"created": len(products)}, status=status.HTTP_201_CREATED)
+
+
+class ProductExportView(APIView):
+    # Full product dump for exports: read plain rows with values() and
+    # stream them out, skipping model instances and the serializer
+    def get(self, request, *args, **kwargs):
+        products = Product.objects.values(
+            'id', 'name', 'price', 'qtty', 'desc').iterator(chunk_size=500)
+        return StreamingHttpResponse(stream_json_array(products),
+                                     content_type='application/json')
     
 
 #code for checkout
@@ -847,6 +909,29 @@ def add_to_cart(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class CartItemBulkCreateView(generics.CreateAPIView):
+    queryset = CartItem.objects.all()
+    serializer_class = CartItemSerializer
+
+    def get_serializer(self, *args, **kwargs):
+        # Accept a list of cart items so a whole cart can be posted in one request
+        kwargs['many'] = isinstance(kwargs.get('data'), list)
+        return super().get_serializer(*args, **kwargs)
+
+    def perform_create(self, serializer):
+        # Items always go into the requesting user's own cart
+        cart = get_cart_instance2(self.request)
+        items = serializer.validated_data
+        if not isinstance(items, list):
+            items = [items]
+
+        products = [item['product'] for item in items]
+        if CartItem.objects.filter(cart=cart, product__in=products).exists():
+            raise ValidationError({"product": "This item already exists in the cart. Use the update quantity option instead."})
+
+        serializer.save(cart=cart)
+
+
 @api_view(['POST'])
 def update_quantity(request):
     # Ensure this returns the cart object, not serialized data